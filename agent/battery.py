@@ -7,6 +7,16 @@ Handles power consumption, charging, and battery-aware decision making.
 
 
 class Battery:
+    __slots__ = (
+        "capacity",
+        "current",
+        "drain_rate",
+        "charge_rate",
+        "total_consumed",
+        "charge_cycles",
+        "_inv_cap",
+    )
+
     def __init__(self, capacity=100, drain_rate=1, charge_rate=5):
         """
         Initializing battery system.
@@ -22,6 +32,7 @@ class Battery:
         self.charge_rate = charge_rate
         self.total_consumed = 0
         self.charge_cycles = 0
+        self._inv_cap = 100.0 / capacity
 
     def consume(self, amount=None):
         """Consume battery power for an action."""
@@ -49,7 +60,7 @@ class Battery:
 
     def get_percentage(self):
         """Get battery percentage."""
-        return (self.current / self.capacity) * 100
+        return self.current * self._inv_cap
 
     def __str__(self):
         return f"Battery: {self.current}/{self.capacity} ({self.get_percentage():.1f}%)"
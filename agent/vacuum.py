@@ -5,22 +5,55 @@ Enhanced VacuumCleaner agent with battery management,
 multiple strategies, and performance optimization.
 """
 
-import heapq
 import random
+from collections import deque
 
+import numpy as np
+
+from utils.astar_nb import astar_grid
 from utils.metrics import PerformanceMetrics
 
 from .battery import Battery
 
+PATH_CACHE_SIZE = 4096
+RANDOM_LOOKAHEAD = 64
+
 
 class VaccumCleaner:
-    def __init__(self, env, strategy="astar", epsilon=1.0):
+    __slots__ = (
+        "env",
+        "x",
+        "y",
+        "cleaned",
+        "epsilon",
+        "battery",
+        "visited",
+        "visited_mask",
+        "path",
+        "_path_goal",
+        "_path_cache",
+        "strategy",
+        "_step_fn",
+        "_handles_low_battery",
+        "_rng",
+        "_move_buffer",
+        "metrics",
+        "charger_pos",
+    )
+
+    _DIRS = ((0, 1), (0, -1), (1, 0), (-1, 0))
+
+    def __init__(
+        self, env, strategy="astar", epsilon=1.0, seed=None, record_detailed=True
+    ):
         """
         Initialize the vacuum cleaner agent.
 
         Args:
             env (Environment): The environment grid
             strategy (str): Cleaning strategy ('random', 'astar', 'optimized')
+            seed (int): Seed for the random strategy's move generator
+            record_detailed (bool): Keep a per-step decision log in metrics
         """
         self.env = env
         self.x, self.y = 0, 0
@@ -28,33 +61,43 @@ class VaccumCleaner:
         self.epsilon = max(1.0, epsilon)  # ε ≥ 1
         self.battery = Battery()
         self.visited = set()
-        self.path = []
+        self.visited_mask = np.zeros((env.size, env.size), dtype=bool)
+        self.path = deque()
+        self._path_goal = None
+        self._path_cache = {}
         self.strategy = strategy
-        self.metrics = PerformanceMetrics()
+        strategies = {
+            "random": self._random_step,
+            "astar": self._astar_step,
+            "optimized": self._optimized_step,
+        }
+        if strategy not in strategies:
+            raise ValueError(f"Unknown strategy: {strategy!r}")
+        self._step_fn = strategies[strategy]
+        self._handles_low_battery = strategy != "random"
+        self._rng = random.Random(seed)
+        self._move_buffer = deque()
+        self.metrics = PerformanceMetrics(record_detailed=record_detailed)
         self.charger_pos = (env.size - 1, env.size - 1)  # Bottom-right corner
 
     def clean(self):
         """Clean current cell if dirty."""
-        if self.env.grid[self.y][self.x] == 1:
-            self.env.grid[self.y][self.x] = 0
+        if (self.x, self.y) in self.env.dirty:
+            self.env.remove_dirt(self.x, self.y)
             self.cleaned += 1
             self.metrics.record_cleaning(self.strategy)
         self.visited.add((self.x, self.y))
+        self.visited_mask[self.y, self.x] = True
 
     def step(self):
         """Perform one simulation step based on strategy."""
         # Check battery and charging needs
-        if self.battery.needs_charging() and self.strategy != "random":
+        if self._handles_low_battery and self.battery.needs_charging():
             self._handle_low_battery()
             return
 
         # Execute strategy
-        if self.strategy == "random":
-            self._random_step()
-        elif self.strategy == "astar":
-            self._astar_step()
-        elif self.strategy == "optimized":
-            self._optimized_step()
+        self._step_fn()
 
         # Record metrics
         self.metrics.record_step(
@@ -66,39 +109,51 @@ class VaccumCleaner:
 
     def _random_step(self):
         """Random movement strategy."""
-        directions = [(0, 1), (0, -1), (1, 0), (-1, 0)]
-        dx, dy = random.choice(directions)
+        if not self._move_buffer:
+            self._move_buffer.extend(self._rng.choices(self._DIRS, k=RANDOM_LOOKAHEAD))
+        dx, dy = self._move_buffer.popleft()
         new_x, new_y = self.x + dx, self.y + dy
 
         if (
             0 <= new_x < self.env.size
             and 0 <= new_y < self.env.size
-            and self.env.grid[new_y][new_x] != -1
+            and self.env.grid[new_y, new_x] != -1
         ):
             self.x, self.y = new_x, new_y
             self.battery.consume()
 
     def _astar_step(self):
         """A* pathfinding strategy."""
-        if not self.path:
-            dirty_cells = self.env.get_dirty_cells()
-            if dirty_cells:
-                nearest = self.get_nearest_dirty(dirty_cells)
-                self.path = self.a_star((self.x, self.y), nearest)
+        if not self.path or self._path_goal not in self.env.dirty:
+            if self.env.dirty:
+                nearest = self.get_nearest_dirty(self.env.dirty)
+                self.path = deque(
+                    self.env.jps_search((self.x, self.y), nearest, self.epsilon)
+                )
+                self._path_goal = nearest
 
-        if self.path:
-            next_cell = self.path.pop(0)
-            self.x, self.y = next_cell
-            self.battery.consume()
+        self._follow_path()
 
     def _optimized_step(self):
         """Optimized strategy with battery awareness."""
         if self.battery.current < 30:  # Conserve energy
             # Only clean nearby dirt
-            nearby_dirt = self._get_nearby_dirt(radius=2)
-            if nearby_dirt:
-                if not self.path or self.path[-1] != nearby_dirt[0]:
+            # Keep following the current path while its target is still dirty
+            # and inside the radius-2 window (a full-battery goal may be far)
+            goal = self._path_goal
+            if (
+                not self.path
+                or goal not in self.env.dirty
+                or max(abs(goal[0] - self.x), abs(goal[1] - self.y)) > 2
+            ):
+                nearby_dirt = self._get_nearby_dirt(radius=2)
+                if nearby_dirt:
                     self.path = self.a_star((self.x, self.y), nearby_dirt[0])
+                    self._path_goal = nearby_dirt[0]
+                else:
+                    self.path.clear()
+                    self._path_goal = None
+            self._follow_path()
         else:
             self._astar_step()
 
@@ -110,28 +165,47 @@ class VaccumCleaner:
                 (self.x, self.y), self.battery.current, "charging", self.strategy
             )
         else:
-            # Navigate to charger
-            if not self.path or self.path[-1] != self.charger_pos:
-                self.path = self.a_star((self.x, self.y), self.charger_pos)
-
-            if self.path:
-                next_cell = self.path.pop(0)
+            # Walk down the precomputed distance field towards the charger
+            next_cell = self._next_towards_charger()
+            if next_cell is not None:
+                self.path.clear()  # any planned path is stale once we move
+                self._path_goal = None
                 self.x, self.y = next_cell
                 self.battery.consume()
 
+    def _next_towards_charger(self):
+        """Return the neighbour one step closer to the charger, if any."""
+        dist = self.env.dist_charger
+        here = dist[self.y, self.x]
+        if here <= 0:
+            return None
+        for dx, dy in self._DIRS:
+            nx, ny = self.x + dx, self.y + dy
+            if (
+                0 <= nx < self.env.size
+                and 0 <= ny < self.env.size
+                and dist[ny, nx] == here - 1
+            ):
+                return nx, ny
+        return None
+
+    def _follow_path(self):
+        """Advance one cell along the planned path, if any."""
+        if self.path:
+            self.x, self.y = self.path.popleft()
+            self.battery.consume()
+
     def _get_nearby_dirt(self, radius=2):
         """Find dirt within specified radius."""
-        nearby = []
-        for dx in range(-radius, radius + 1):
-            for dy in range(-radius, radius + 1):
-                nx, ny = self.x + dx, self.y + dy
-                if (
-                    0 <= nx < self.env.size
-                    and 0 <= ny < self.env.size
-                    and self.env.grid[ny][nx] == 1
-                ):
-                    nearby.append((nx, ny))
-        return sorted(nearby, key=lambda c: abs(c[0] - self.x) + abs(c[1] - self.y))
+        size = self.env.size
+        y0, y1 = max(0, self.y - radius), min(size, self.y + radius + 1)
+        x0, x1 = max(0, self.x - radius), min(size, self.x + radius + 1)
+        ys, xs = np.nonzero(self.env.grid[y0:y1, x0:x1] == 1)
+        xs += x0
+        ys += y0
+        # Nearest first; equal distances keep the original x-then-y scan order
+        order = np.lexsort((ys, xs, np.abs(xs - self.x) + np.abs(ys - self.y)))
+        return list(zip(xs[order].tolist(), ys[order].tolist()))
 
     def get_nearest_dirty(self, dirty_cells):
         """Return the closest dirty cell based on Manhattan distance."""
@@ -139,34 +213,18 @@ class VaccumCleaner:
 
     def a_star(self, start, goal):
         """Perform A* pathfinding from start to goal avoiding obstacles."""
-        grid = self.env.grid
-        size = self.env.size
-        open_set = []
-        heapq.heappush(open_set, (0 + self.heuristic(start, goal), 0, start, [start]))
-        visited = set()
-
-        while open_set:
-            f, g, current, path = heapq.heappop(open_set)
-            if current == goal:
-                return path[1:]
-            if current in visited:
-                continue
-            visited.add(current)
-            x, y = current
-
-            for dx, dy in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
-                nx, ny = x + dx, y + dy
-                if 0 <= nx < size and 0 <= ny < size and grid[ny][nx] != -1:
-                    neighbor = (nx, ny)
-                    if neighbor not in visited:
-                        g_new = g + 1
-                        f_new = g_new + self.epsilon * self.heuristic(neighbor, goal)
-                        heapq.heappush(
-                            open_set, (f_new, g_new, neighbor, path + [neighbor])
-                        )
-
-        return []
-
-    def heuristic(self, a, b):
-        """Compute Manhattan distance heuristic between points a and b."""
-        return abs(a[0] - b[0]) + abs(a[1] - b[1])
+        # Paths only depend on obstacles, so dirt changes don't invalidate them
+        key = (start, goal, self.epsilon, self.env.grid_version)
+        cached = self._path_cache.get(key)
+        if cached is not None:
+            return deque(cached)
+
+        packed = astar_grid(
+            self.env.padded, start[0], start[1], goal[0], goal[1], self.epsilon
+        )
+        path = tuple((int(p >> 16), int(p & 0xFFFF)) for p in packed)
+
+        if len(self._path_cache) >= PATH_CACHE_SIZE:
+            self._path_cache.clear()
+        self._path_cache[key] = path
+        return deque(path)
@@ -1,5 +1,3 @@
-import random
-
 """
 grid.py
 --------
@@ -12,26 +10,46 @@ The environment is a grid (2D matrix) where:
   2 = charging station (future use)
 """
 
+from collections import deque
+
+import numpy as np
+
+from utils.jps import build_jump_table, jps_grid
+
 
 class Environment:
-    def __init__(self, size=5, dirt_prob=0.2):
+    def __init__(self, size=5, dirt_prob=0.2, rng=None):
         """
         Initialize a grid environment.
 
         Args:
             size (int): Dimension of the square grid.
             dirt_prob (float): Probability that a given cell starts with dirt.
+            rng (np.random.Generator): Source of the dirt layout; defaults to
+                the global NumPy RNG.
         """
         self.size = size
-        self.grid = [
-            [0 if random.random() > dirt_prob else 1 for _ in range(size)]
-            for _ in range(size)
-        ]
+
+        # The grid is the interior view of a copy bordered by obstacles, so
+        # searches can skip bounds checks and edits need no syncing
+        self.padded = np.full((size + 2, size + 2), -1, dtype=np.int8)
+        self.grid = self.padded[1:-1, 1:-1]
+        rng = np.random if rng is None else rng
+        self.grid[:] = rng.random((size, size)) < dirt_prob
 
         # Defining special cells
-        self.grid[0][0] = 0  # starting cell (clean)
-        self.grid[size - 1][size - 1] = 2  # charging station
-        self.grid[2][2] = -1  # example obstacle
+        self.grid[0, 0] = 0  # starting cell (clean)
+        self.grid[size - 1, size - 1] = 2  # charging station
+        self.grid[2, 2] = -1  # example obstacle
+
+        # Dirty cells as (x, y), kept in sync by remove_dirt()
+        ys, xs = np.nonzero(self.grid == 1)
+        self.dirty = set(zip(xs.tolist(), ys.tolist()))
+
+        # Bumped whenever the obstacle layout changes (invalidates cached paths)
+        self.grid_version = 0
+        self.jump_table = build_jump_table(self.padded)
+        self.dist_charger = self._charger_distances()
 
     def show(self):
         """Printing the grid to the console"""
@@ -40,10 +58,46 @@ class Environment:
         print()
 
     def get_dirty_cells(self):
-        """Return list of coordinates of all dirty cells."""
-        dirty = []
-        for y in range(self.size):
-            for x in range(self.size):
-                if self.grid[y][x] == 1:
-                    dirty.append((x, y))
-        return dirty
+        """Return the set of coordinates of all dirty cells."""
+        return self.dirty
+
+    def remove_dirt(self, x, y):
+        """Mark cell (x, y) as clean."""
+        self.grid[y, x] = 0
+        self.dirty.discard((x, y))
+
+    def add_obstacle(self, x, y):
+        """Place an obstacle at cell (x, y)."""
+        self.grid[y, x] = -1
+        self.dirty.discard((x, y))
+        self.grid_version += 1
+        self.jump_table = build_jump_table(self.padded)
+        self.dist_charger = self._charger_distances()
+
+    def jps_search(self, start, goal, epsilon=1.0):
+        """Shortest path from start to goal using the cached JPS+ table."""
+        packed = jps_grid(
+            self.padded, self.jump_table, start[0], start[1], goal[0], goal[1], epsilon
+        )
+        return [(int(p >> 16), int(p & 0xFFFF)) for p in packed]
+
+    def _charger_distances(self):
+        """BFS step count from every cell to the charger (-1 if unreachable)."""
+        size = self.size
+        dist = np.full((size, size), -1, dtype=np.int16)
+        charger = (size - 1, size - 1)
+        dist[charger[1], charger[0]] = 0
+        queue = deque([charger])
+        while queue:
+            x, y = queue.popleft()
+            for dx, dy in ((0, 1), (0, -1), (1, 0), (-1, 0)):
+                nx, ny = x + dx, y + dy
+                if (
+                    0 <= nx < size
+                    and 0 <= ny < size
+                    and dist[ny, nx] == -1
+                    and self.grid[ny, nx] != -1
+                ):
+                    dist[ny, nx] = dist[y, x] + 1
+                    queue.append((nx, ny))
+        return dist
@@ -48,6 +48,9 @@ class GuiController:
 
     def _toggle_run(self, event):
         self.running = not self.running
+        if not self.running:
+            # Show the latest state even if its frame was skipped
+            self.viz.update_display(self.env, self.vac, self.step_cnt, force=True)
 
     def _request_quit(self, event):
         self.quit_requested = True
@@ -65,24 +68,28 @@ class GuiController:
 
             # 2. Simulation Logic
             if self.running and not self.finished:
-                if not self.env.get_dirty_cells() or self.vac.battery.is_empty():
+                if not self.env.dirty or self.vac.battery.is_empty():
                     self.finished = True
                     self.running = False
+                    self.viz.update_display(
+                        self.env, self.vac, self.step_cnt, force=True
+                    )
                     self.viz.show_final_stats(self.vac)
                 else:
                     self.vac.step()
                     self.step_cnt += 1
 
+                    # Frames are throttled inside update_display
                     self.viz.update_display(self.env, self.vac, self.step_cnt)
 
                     # DYNAMIC DELAY: Read from the slider
                     # Default to 0.2s if slider isn't ready
                     delay = self.viz.speed_slider.val if self.viz.speed_slider else 0.2
-                    plt.pause(delay)
+                    self.viz.fig.canvas.start_event_loop(delay)
 
-            # 3. Idle Handling
+            # 3. Idle Handling: pump GUI events only, nothing to redraw
             else:
-                plt.pause(0.1)
+                self.viz.fig.canvas.start_event_loop(0.1)
 
         plt.close("all")
         print("Simulation exited.")
@@ -99,7 +106,7 @@ def run_single_simulation(strategy="astar", visualize=True, epsilon=1.0):
         env = Environment(size=5, dirt_prob=0.3)
         vacuum = VaccumCleaner(env, strategy=strategy, epsilon=epsilon)
         for _ in range(100):
-            if not env.get_dirty_cells() or vacuum.battery.is_empty():
+            if not env.dirty or vacuum.battery.is_empty():
                 break
             vacuum.step()
         summary = vacuum.metrics.generate_summary()
@@ -0,0 +1,159 @@
+"""
+astar_nb.py
+-----------
+Numba-compiled weighted A* over the environment grid.
+
+The search works on flat indices into the obstacle-bordered grid
+(idx = (y + 1) * (size + 2) + (x + 1)) with dense g-score / parent arrays
+and a hand-rolled indexed binary heap supporting decrease-key, since heapq
+and Python sets are not available in nopython mode.
+"""
+
+import numpy as np
+from numba import njit
+
+INT_MAX = np.iinfo(np.int32).max
+
+
+@njit(cache=True)
+def _heap_less(f_score, g_score, a, b):
+    """Order nodes by (f, g, node), like the heapq tuples they replace."""
+    if f_score[a] != f_score[b]:
+        return f_score[a] < f_score[b]
+    if g_score[a] != g_score[b]:
+        return g_score[a] < g_score[b]
+    return a < b
+
+
+@njit(cache=True)
+def _sift_up(heap, pos, f_score, g_score, i):
+    node = heap[i]
+    while i > 0:
+        parent = (i - 1) >> 1
+        if not _heap_less(f_score, g_score, node, heap[parent]):
+            break
+        heap[i] = heap[parent]
+        pos[heap[i]] = i
+        i = parent
+    heap[i] = node
+    pos[node] = i
+
+
+@njit(cache=True)
+def _sift_down(heap, pos, f_score, g_score, i, count):
+    node = heap[i]
+    while True:
+        child = 2 * i + 1
+        if child >= count:
+            break
+        if child + 1 < count and _heap_less(
+            f_score, g_score, heap[child + 1], heap[child]
+        ):
+            child += 1
+        if not _heap_less(f_score, g_score, heap[child], node):
+            break
+        heap[i] = heap[child]
+        pos[heap[i]] = i
+        i = child
+    heap[i] = node
+    pos[node] = i
+
+
+@njit(cache=True)
+def _heap_push(heap, pos, f_score, g_score, count, node):
+    """Insert a node keyed on its current f/g. Returns the new heap size."""
+    heap[count] = node
+    _sift_up(heap, pos, f_score, g_score, count)
+    return count + 1
+
+
+@njit(cache=True)
+def _heap_pop(heap, pos, f_score, g_score, count):
+    """Remove the best node. Returns (node, new heap size)."""
+    node = heap[0]
+    pos[node] = -1
+    count -= 1
+    if count > 0:
+        heap[0] = heap[count]
+        _sift_down(heap, pos, f_score, g_score, 0, count)
+    return node, count
+
+
+@njit(cache=True)
+def astar_grid(padded, sx, sy, gx, gy, epsilon):
+    """
+    Weighted A* from (sx, sy) to (gx, gy) on a 4-connected grid.
+
+    Args:
+        padded (np.ndarray): int8 (size + 2, size + 2) grid with a border of
+            -1 obstacles, so the bounds check folds into the obstacle check
+        sx, sy (int): Start cell (unpadded coordinates)
+        gx, gy (int): Goal cell (unpadded coordinates)
+        epsilon (float): Heuristic weight (ε ≥ 1)
+
+    Returns:
+        np.ndarray: int32 array of packed (x << 16 | y) cells from the first
+        step after start up to and including the goal; empty if unreachable.
+    """
+    width = padded.shape[1]
+    n = width * padded.shape[0]
+    flat = padded.ravel()
+    start = (sy + 1) * width + (sx + 1)
+    goal = (gy + 1) * width + (gx + 1)
+    # Tie-breaker: nudge h up by less than one step so equal-f nodes nearer
+    # the goal win, without changing which path lengths are optimal
+    weight = epsilon * (1.0 + 1.0 / ((width - 2) * (width - 2)))
+    offsets = (width, -width, 1, -1)
+
+    g_score = np.full(n, INT_MAX, np.int32)
+    f_score = np.full(n, np.inf, np.float64)
+    came_from = np.full(n, -1, np.int32)
+    closed = np.zeros(n, np.bool_)
+
+    # Indexed heap: each open node appears once, pos[node] is its heap slot
+    heap = np.empty(n, np.int32)
+    pos = np.full(n, -1, np.int32)
+
+    g_score[start] = 0
+    f_score[start] = weight * (abs(sx - gx) + abs(sy - gy))
+    count = _heap_push(heap, pos, f_score, g_score, 0, start)
+
+    while count > 0:
+        current, count = _heap_pop(heap, pos, f_score, g_score, count)
+        if current == goal:
+            break
+        closed[current] = True
+        g = g_score[current]
+
+        for offset in offsets:
+            neighbor = current + offset
+            if flat[neighbor] == -1 or closed[neighbor]:
+                continue
+            g_new = g + 1
+            if g_new < g_score[neighbor]:
+                nx = neighbor % width - 1
+                ny = neighbor // width - 1
+                g_score[neighbor] = g_new
+                f_score[neighbor] = g_new + weight * (abs(nx - gx) + abs(ny - gy))
+                came_from[neighbor] = current
+                if pos[neighbor] == -1:
+                    count = _heap_push(heap, pos, f_score, g_score, count, neighbor)
+                else:
+                    # decrease-key: f only ever drops, so sifting up suffices
+                    _sift_up(heap, pos, f_score, g_score, pos[neighbor])
+
+    if came_from[goal] == -1:
+        return np.empty(0, np.int32)
+
+    length = 0
+    node = goal
+    while node != start:
+        length += 1
+        node = came_from[node]
+
+    path = np.empty(length, np.int32)
+    node = goal
+    for i in range(length - 1, -1, -1):
+        path[i] = ((node % width - 1) << 16) | (node // width - 1)
+        node = came_from[node]
+    return path
@@ -0,0 +1,227 @@
+"""
+jps.py
+-------
+Numba-compiled Jump Point Search (JPS+) for the 4-connected, uniform-cost grid.
+
+Symmetric paths are pruned with a "vertical first" canonical ordering:
+vertical runs scan sideways at every cell, horizontal runs only stop where
+an obstacle forces a turn. The jump distances for each cell and direction
+depend only on the obstacle layout, so they are precomputed once per
+environment and the runtime search just reads them.
+
+Both kernels read obstacles from the -1 bordered grid, like the A* kernel,
+so neighbour lookups need no bounds checks. Nodes are numbered x * size + y
+so heap ties resolve in (x, y) order.
+"""
+
+import numpy as np
+from numba import njit
+
+from utils.astar_nb import INT_MAX, _heap_pop, _heap_push, _sift_up
+
+# Direction index -> (dx, dy): east, west, south, north
+DIRS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+EAST, WEST, SOUTH, NORTH = range(4)
+
+
+@njit(cache=True)
+def _free(padded, x, y):
+    """Whether (x, y) is walkable; the border makes off-grid cells walls."""
+    return padded[y + 1, x + 1] != -1
+
+
+@njit(cache=True)
+def _chain(nxt):
+    return nxt + 1 if nxt > 0 else nxt - 1
+
+
+@njit(cache=True)
+def build_jump_table(padded):
+    """
+    Precompute jump distances for every cell and direction.
+
+    Args:
+        padded (np.ndarray): int8 (size + 2, size + 2) grid with a border of
+            -1 obstacles
+
+    Returns:
+        np.ndarray: int16 (size, size, 4) table. A positive entry is the
+        distance to the next jump point; zero or negative is minus the
+        number of free cells before a wall.
+    """
+    size = padded.shape[0] - 2
+    table = np.zeros((size, size, 4), dtype=np.int16)
+
+    # Horizontal runs: stop where a vertical neighbour opens up behind us
+    for y in range(size):
+        for i in range(size):
+            for d, x, dx in ((EAST, size - 1 - i, 1), (WEST, i, -1)):
+                nx = x + dx
+                if not _free(padded, nx, y):
+                    table[y, x, d] = 0
+                elif (_free(padded, nx, y + 1) and not _free(padded, x, y + 1)) or (
+                    _free(padded, nx, y - 1) and not _free(padded, x, y - 1)
+                ):
+                    table[y, x, d] = 1
+                else:
+                    table[y, x, d] = _chain(table[y, nx, d])
+
+    # Vertical runs: stop wherever a sideways scan would find a jump point
+    for x in range(size):
+        for i in range(size):
+            for d, y, dy in ((SOUTH, size - 1 - i, 1), (NORTH, i, -1)):
+                ny = y + dy
+                if not _free(padded, x, ny):
+                    table[y, x, d] = 0
+                elif table[ny, x, EAST] > 0 or table[ny, x, WEST] > 0:
+                    table[y, x, d] = 1
+                else:
+                    table[y, x, d] = _chain(table[ny, x, d])
+
+    return table
+
+
+@njit(cache=True)
+def _jump(table, x, y, d, gx, gy):
+    """Return the next jump point from (x, y) in direction d as (ok, x, y)."""
+    dx, dy = DIRS[d]
+    dist = int(table[y, x, d])
+    reach = dist if dist > 0 else -dist
+
+    # The goal (or, moving vertically, the goal's row) ends a run early
+    if dy == 0:
+        k = (gx - x) * dx if gy == y else 0
+    else:
+        k = (gy - y) * dy
+    if 0 < k <= reach and (dist <= 0 or k <= dist):
+        return True, x + k * dx, y + k * dy
+
+    if dist > 0:
+        return True, x + dist * dx, y + dist * dy
+    return False, x, y
+
+
+@njit(cache=True)
+def _successor_dirs(padded, x, y, px, py, out):
+    """
+    Fill out with the directions worth exploring from (x, y) given we came
+    from (px, py); px < 0 marks the start. Returns how many were written.
+    """
+    if px < 0:
+        for d in range(4):
+            out[d] = d
+        return 4
+
+    if py == y:
+        dx = 1 if x > px else -1
+        out[0] = EAST if dx == 1 else WEST
+        count = 1
+        # Forced neighbours: the cell behind us on that side is blocked
+        for sy, d in ((1, SOUTH), (-1, NORTH)):
+            if _free(padded, x, y + sy) and not _free(padded, x - dx, y + sy):
+                out[count] = d
+                count += 1
+        return count
+
+    out[0] = SOUTH if y > py else NORTH
+    out[1] = EAST
+    out[2] = WEST
+    return 3
+
+
+@njit(cache=True)
+def jps_grid(padded, table, sx, sy, gx, gy, epsilon):
+    """
+    Weighted JPS+ from (sx, sy) to (gx, gy).
+
+    Args:
+        padded (np.ndarray): int8 (size + 2, size + 2) grid with a border of
+            -1 obstacles
+        table (np.ndarray): Jump table from build_jump_table(padded)
+        sx, sy (int): Start cell (unpadded coordinates)
+        gx, gy (int): Goal cell (unpadded coordinates)
+        epsilon (float): Heuristic weight (ε ≥ 1)
+
+    Returns:
+        np.ndarray: int32 array of packed (x << 16 | y) cells from the first
+        step after start up to and including the goal; empty if unreachable.
+    """
+    size = table.shape[0]
+    n = size * size
+    start = sx * size + sy
+    goal = gx * size + gy
+    if start == goal:
+        return np.empty(0, np.int32)
+
+    # Same tie-breaking nudge as the A* kernel
+    weight = epsilon * (1.0 + 1.0 / n)
+
+    g_score = np.full(n, INT_MAX, np.int32)
+    f_score = np.full(n, np.inf, np.float64)
+    came_from = np.full(n, -1, np.int32)
+    closed = np.zeros(n, np.bool_)
+    heap = np.empty(n, np.int32)
+    pos = np.full(n, -1, np.int32)
+    dirs = np.empty(4, np.int64)
+
+    g_score[start] = 0
+    f_score[start] = weight * (abs(sx - gx) + abs(sy - gy))
+    count = _heap_push(heap, pos, f_score, g_score, 0, start)
+
+    while count > 0:
+        current, count = _heap_pop(heap, pos, f_score, g_score, count)
+        if current == goal:
+            break
+        closed[current] = True
+        cx, cy = current // size, current % size
+        parent = came_from[current]
+        if parent < 0:
+            px, py = -1, -1
+        else:
+            px, py = parent // size, parent % size
+
+        for i in range(_successor_dirs(padded, cx, cy, px, py, dirs)):
+            ok, nx, ny = _jump(table, cx, cy, dirs[i], gx, gy)
+            nxt = nx * size + ny
+            if not ok or closed[nxt]:
+                continue
+            g_new = g_score[current] + abs(nx - cx) + abs(ny - cy)
+            if g_new < g_score[nxt]:
+                g_score[nxt] = g_new
+                f_score[nxt] = g_new + weight * (abs(nx - gx) + abs(ny - gy))
+                came_from[nxt] = current
+                if pos[nxt] == -1:
+                    count = _heap_push(heap, pos, f_score, g_score, count, nxt)
+                else:
+                    # decrease-key: h is fixed per node, so f only drops
+                    _sift_up(heap, pos, f_score, g_score, pos[nxt])
+
+    if came_from[goal] == -1:
+        return np.empty(0, np.int32)
+    return _expand(came_from, start, goal, size)
+
+
+@njit(cache=True)
+def _expand(came_from, start, goal, size):
+    """Turn the chain of jump points into packed single-cell steps."""
+    length = 0
+    node = goal
+    while node != start:
+        prev = came_from[node]
+        length += abs(node // size - prev // size) + abs(node % size - prev % size)
+        node = prev
+
+    path = np.empty(length, np.int32)
+    i = length
+    node = goal
+    while node != start:
+        prev = came_from[node]
+        x0, y0 = prev // size, prev % size
+        x1, y1 = node // size, node % size
+        dx = (x1 > x0) - (x1 < x0)
+        dy = (y1 > y0) - (y1 < y0)
+        for k in range(abs(x1 - x0) + abs(y1 - y0), 0, -1):
+            i -= 1
+            path[i] = ((x0 + k * dx) << 16) | (y0 + k * dy)
+        node = prev
+    return path
@@ -9,17 +9,34 @@ import json
 import time
 from datetime import datetime
 
+ACTIONS = ("move", "charging")
+ACTION_CODE = {name: code for code, name in enumerate(ACTIONS)}
+STRATEGIES = ("random", "astar", "optimized")
+STRATEGY_CODE = {name: code for code, name in enumerate(STRATEGIES)}
+
 
 class PerformanceMetrics:
-    def __init__(self):
-        """Initialize metrics tracking."""
+    def __init__(self, record_detailed=True):
+        """
+        Initialize metrics tracking.
+
+        Args:
+            record_detailed (bool): Keep the per-step decision log. Batch
+                runs that only read aggregates can turn this off.
+        """
+        self.record_detailed = record_detailed
         self.start_time = time.time()
         self.steps_taken = 0
         self.dirt_cleaned = 0
         self.cells_visited = set()
         self.battery_usage = []
         self.path_efficiency = []
-        self.decisions_made = []
+
+        # Per-step decision log, stored column-wise (one entry per step)
+        self.steps_x = []
+        self.steps_y = []
+        self.actions = []
+        self.step_strategies = []
 
         # Strategy comparison metrics
         self.strategies_tested = {
@@ -29,19 +46,34 @@ class PerformanceMetrics:
         }
 
     def record_step(self, position, battery_level, action, strategy="astar"):
-        """Record a single simulation step."""
+        """
+        Record a single simulation step.
+
+        Args:
+            position (tuple): (x, y) cell after the step
+            battery_level (float): Battery charge after the step
+            action (str): One of ACTIONS ("move", "charging")
+            strategy (str): One of STRATEGIES ("random", "astar", "optimized")
+        """
+        # The columnar log stores codes, so names must come from the tables
+        action_code = ACTION_CODE.get(action)
+        if action_code is None:
+            raise ValueError(f"Unknown action {action!r}; expected one of {ACTIONS}")
+        strategy_code = STRATEGY_CODE.get(strategy)
+        if strategy_code is None:
+            raise ValueError(
+                f"Unknown strategy {strategy!r}; expected one of {STRATEGIES}"
+            )
+
         self.steps_taken += 1
         self.cells_visited.add(position)
         self.battery_usage.append(battery_level)
-        self.decisions_made.append(
-            {
-                "step": self.steps_taken,
-                "position": position,
-                "action": action,
-                "battery": battery_level,
-                "strategy": strategy,
-            }
-        )
+        if not self.record_detailed:
+            return
+        self.steps_x.append(position[0])
+        self.steps_y.append(position[1])
+        self.actions.append(action_code)
+        self.step_strategies.append(strategy_code)
 
     def record_cleaning(self, strategy="astar"):
         """Record dirt cleaning event."""
@@ -77,12 +109,33 @@ class PerformanceMetrics:
             "strategies_comparison": self.strategies_tested,
         }
 
+    def detailed_steps(self):
+        """Rebuild the per-step decision records from the columnar log."""
+        return [
+            {
+                "step": i + 1,
+                "position": (x, y),
+                "action": ACTIONS[action],
+                "battery": battery,
+                "strategy": STRATEGIES[strategy],
+            }
+            for i, (x, y, action, battery, strategy) in enumerate(
+                zip(
+                    self.steps_x,
+                    self.steps_y,
+                    self.actions,
+                    self.battery_usage,
+                    self.step_strategies,
+                )
+            )
+        ]
+
     def save_report(self, filename="simulation_report.json"):
         """Save detailed metrics to file."""
         report = {
             "timestamp": datetime.now().isoformat(),
             "summary": self.generate_summary(),
-            "detailed_steps": self.decisions_made,
+            "detailed_steps": self.detailed_steps(),
             "battery_usage": self.battery_usage,
         }
 
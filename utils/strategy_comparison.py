@@ -5,61 +5,129 @@ Compare different cleaning strategies and analyze performance.
 """
 
 import json
+import math
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
 
 import numpy as np
 
+from agent.vacuum import VaccumCleaner
 from environment.grid import Environment
 
+# Smallest sweep worth a process pool. A run takes ~0.05 ms; a forked pool
+# starts in ~8 ms, a spawned one (Windows, macOS) needs ~0.75 s because every
+# worker re-imports numpy and numba
+POOL_MIN_TASKS = 100
+SPAWN_POOL_MIN_TASKS = 10000
+
+
+def _pool_min_tasks():
+    """Pool threshold for the start method new workers will use."""
+    method = mp.get_start_method(allow_none=True) or mp.get_all_start_methods()[0]
+    return POOL_MIN_TASKS if method == "fork" else SPAWN_POOL_MIN_TASKS
+
+
+def _one_run(task):
+    """Run a single seeded simulation and return its result record."""
+    strategy, eps, run, grid_size, dirt_prob, seed = task
+    # A private generator, so runs never touch the caller's global RNG
+    env = Environment(grid_size, dirt_prob, rng=np.random.default_rng(seed))
+
+    # Only aggregates are reported, so skip the per-step decision log
+    if strategy == "astar":
+        vacuum = VaccumCleaner(
+            env, strategy="astar", epsilon=eps, seed=seed, record_detailed=False
+        )
+    else:
+        vacuum = VaccumCleaner(env, strategy, seed=seed, record_detailed=False)
+
+    # Run simulation
+    max_steps = 100
+    for step in range(max_steps):
+        if not env.dirty or vacuum.battery.is_empty():
+            break
+        vacuum.step()
+
+    # Collect results
+    return {
+        "run": run + 1,
+        "epsilon": eps,
+        "steps": vacuum.metrics.steps_taken,
+        "dirt_cleaned": vacuum.cleaned,
+        "battery_used": vacuum.battery.total_consumed,
+        "efficiency": vacuum.metrics.calculate_efficiency(),
+        "coverage": vacuum.metrics.calculate_coverage(grid_size**2),
+        "battery_remaining": vacuum.battery.current,
+    }
+
+
+def _accumulate(stats, record):
+    """Fold one result record into running (Welford) summary statistics."""
+    stats["n"] += 1
+    n = stats["n"]
+    delta = record["steps"] - stats["mean_steps"]
+    stats["mean_steps"] += delta / n
+    stats["m2_steps"] += delta * (record["steps"] - stats["mean_steps"])
+    stats["mean_efficiency"] += (record["efficiency"] - stats["mean_efficiency"]) / n
+    stats["mean_coverage"] += (record["coverage"] - stats["mean_coverage"]) / n
+    stats["successes"] += record["dirt_cleaned"] >= 6
+
 
 class StrategyComparator:
-    def __init__(self, grid_size=5, dirt_prob=0.3, runs_per_strategy=5):
+    def __init__(
+        self,
+        grid_size=5,
+        dirt_prob=0.3,
+        runs_per_strategy=5,
+        seed=None,
+        max_workers=None,
+    ):
         """Initialize comparison framework."""
         self.grid_size = grid_size
         self.dirt_prob = dirt_prob
         self.runs_per_strategy = runs_per_strategy
+        self.seed = seed
+        self.max_workers = max_workers
         self.strategies = ["random", "astar", "optimized"]
         self.results = {}
+        self.stats = {}
 
     def run_comparison(self):
         """Run comprehensive strategy comparison."""
+        tasks = []
         for strategy in self.strategies:
             print(f"Testing {strategy} strategy...")
-            strategy_results = []
-
             epsilons = [1.0, 1.5, 2.0] if strategy == "astar" else [None]
-
             for eps in epsilons:
                 for run in range(self.runs_per_strategy):
-                    env = Environment(self.grid_size, self.dirt_prob)
-
-                    if strategy == "astar":
-                        vacuum = vacuumCleaner(env, strategy="astar", epsilon=eps)
-                    else:
-                        vacuum = vacuumCleaner(env, strategy)
-
-                    # Run simulation
-                    max_steps = 100
-                    for step in range(max_steps):
-                        if not env.get_dirty_cells() or vacuum.battery.is_empty():
-                            break
-                        vacuum.step()
-
-                    # Collect results
-                    result = {
-                        "run": run + 1,
-                        "epsilon": eps,
-                        "steps": vacuum.metrics.steps_taken,
-                        "dirt_cleaned": vacuum.cleaned,
-                        "battery_used": vacuum.battery.total_consumed,
-                        "efficiency": vacuum.metrics.calculate_efficiency(),
-                        "coverage": vacuum.metrics.calculate_coverage(
-                            self.grid_size**2
-                        ),
-                        "battery_remaining": vacuum.battery.current,
-                    }
-                    strategy_results.append(result)
-
-            self.results[strategy] = strategy_results
+                    tasks.append((strategy, eps, run, self.grid_size, self.dirt_prob))
+
+        # Runs share no state, so large sweeps fan out over processes with
+        # independent seeds (reproducible when self.seed is set)
+        seeds = np.random.SeedSequence(self.seed).generate_state(len(tasks))
+        tasks = [task + (int(seed),) for task, seed in zip(tasks, seeds)]
+
+        if self.max_workers == 1 or len(tasks) < _pool_min_tasks():
+            records = [_one_run(task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as ex:
+                records = list(ex.map(_one_run, tasks, chunksize=64))
+
+        self.results = {strategy: [] for strategy in self.strategies}
+        self.stats = {
+            strategy: {
+                "n": 0,
+                "mean_steps": 0.0,
+                "m2_steps": 0.0,
+                "mean_efficiency": 0.0,
+                "mean_coverage": 0.0,
+                "successes": 0,
+            }
+            for strategy in self.strategies
+        }
+        for task, record in zip(tasks, records):
+            self.results[task[0]].append(record)
+            _accumulate(self.stats[task[0]], record)
 
         return self.results
 
@@ -68,18 +136,15 @@ class StrategyComparator:
         report = {}
 
         for strategy in self.strategies:
-            results = self.results[strategy]
-            steps = [r["steps"] for r in results]
-            efficiency = [r["efficiency"] for r in results]
-            coverage = [r["coverage"] for r in results]
+            stats = self.stats[strategy]
+            n = stats["n"]
 
             report[strategy] = {
-                "avg_steps": np.mean(steps),
-                "std_steps": np.std(steps),
-                "avg_efficiency": np.mean(efficiency),
-                "avg_coverage": np.mean(coverage),
-                "success_rate": len([r for r in results if r["dirt_cleaned"] >= 6])
-                / len(results),
+                "avg_steps": stats["mean_steps"],
+                "std_steps": math.sqrt(stats["m2_steps"] / n),
+                "avg_efficiency": stats["mean_efficiency"],
+                "avg_coverage": stats["mean_coverage"],
+                "success_rate": stats["successes"] / n,
             }
 
         return report
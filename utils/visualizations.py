@@ -3,26 +3,116 @@ visualizations.py
 Final visualization kit with Speed and Epsilon controls.
 """
 
-import matplotlib
-import numpy as np
-
-matplotlib.use("TkAgg")
+import io
+import os
+import sys
+import threading
+import time
 from datetime import datetime
 
+import matplotlib
+import matplotlib.image as mimage
 import matplotlib.pyplot as plt
-import matplotlib.widgets as widgets
-import seaborn as sns
-from matplotlib.colors import ListedColormap
+import numpy as np
+from cycler import cycler
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.colors import ListedColormap, Normalize
+from matplotlib.figure import Figure
 from matplotlib.patches import Rectangle
+from numba import njit
 
 plt.ion()  # Non-blocking mode
-sns.set_palette("husl")
+# seaborn's six-colour "husl" palette, without importing seaborn
+plt.rcParams["axes.prop_cycle"] = cycler(
+    color=["#f77189", "#bb9832", "#50b131", "#36ada4", "#3ba3ec", "#e866f4"]
+)
+
+MAX_FPS = 30  # redraw cap for update_display
+
+
+@njit(
+    "void(int8[:, :], boolean[:, :], int64, int64, uint8[:], int64, int64,"
+    " uint8[:, :])",
+    cache=True,
+)
+def _build_frame(grid, visited_mask, vy, vx, lut, scale, line, out):
+    """
+    Fused single pass: grid colour, visited overlay and the vacuum, with each
+    cell scale x scale pixels, then the cell gridlines line pixels wide.
+    """
+    rows, cols = grid.shape
+    for y in range(rows):
+        for x in range(cols):
+            colour = lut[grid[y, x] + 1]
+            if colour == 0 and visited_mask[y, x]:
+                colour = 4  # visited
+            if y == vy and x == vx:
+                colour = 5  # vacuum
+            out[y * scale : (y + 1) * scale, x * scale : (x + 1) * scale] = colour
+
+    # Gridlines on the top/left edge of every cell, centred on the boundary
+    if line < scale:
+        for b in range(rows):
+            lo = b * scale - line // 2
+            out[max(lo, 0) : lo + line, :] = 6
+        for b in range(cols):
+            lo = b * scale - line // 2
+            out[:, max(lo, 0) : lo + line] = 6
+
+
+def _headless():
+    """True on X11 platforms with no display to open windows on."""
+    return (
+        os.name == "posix"
+        and sys.platform != "darwin"
+        and not os.environ.get("DISPLAY")
+    )
+
+
+def _use_gui_backend():
+    """Switch to TkAgg for the live window unless a GUI backend is active."""
+    if not matplotlib.get_backend().lower().startswith(("tk", "qt")):
+        matplotlib.use("TkAgg", force=True)
+
+
+def _box_stats(data, label):
+    """Box plot stats for ax.bxp, with boxplot's default 1.5 IQR whiskers."""
+    if data.size == 0:
+        # Like cbook.boxplot_stats: an empty box that draws nothing
+        nan = np.nan
+        return {
+            "label": label,
+            "med": nan,
+            "q1": nan,
+            "q3": nan,
+            "whislo": nan,
+            "whishi": nan,
+            "fliers": data,
+        }
+    q1, med, q3 = np.percentile(data, [25, 50, 75])
+    iqr = q3 - q1
+    inside = data[(data >= q1 - 1.5 * iqr) & (data <= q3 + 1.5 * iqr)]
+    # Whiskers never end inside the box, even with interpolated quartiles
+    lo = min(inside.min(), q1)
+    hi = max(inside.max(), q3)
+    return {
+        "label": label,
+        "med": med,
+        "q1": q1,
+        "q3": q3,
+        "whislo": lo,
+        "whishi": hi,
+        "fliers": data[(data < lo) | (data > hi)],
+    }
 
 
 def show_non_blocking():
     """Draw canvas but return control to terminal."""
-    plt.draw()
-    plt.pause(0.001)
+    # plt.pause would also run (and sleep in) a short event loop
+    if plt.get_fignums():
+        canvas = plt.gcf().canvas
+        canvas.draw_idle()
+        canvas.flush_events()
 
 
 class VisualizationManager:
@@ -31,13 +121,24 @@ class VisualizationManager:
     def __init__(self):
         plt.style.use("seaborn-v0_8-darkgrid")
         # colormap: 0 clean 1 dirt 2 obstacle 3 charger 4 visited 5 vacuum
+        # 6 gridline
         self.cmap = ListedColormap(
-            ["white", "saddlebrown", "black", "green", "royalblue", "red"]
+            ["white", "saddlebrown", "black", "green", "royalblue", "red", "gray"]
         )
         self.fig = None
         self.ax = None
         self.texts = {}
+        self._overlays = []  # extra texts drawn over the grid (final stats)
+        self._im = None  # grid AxesImage, updated in place every frame
         self.speed_slider = None  # Reference to speed slider
+        # grid value (-1 obstacle, 0 clean, 1 dirt, 2 charger) + 1 -> colour index
+        self._lut = np.array([2, 0, 1, 3], dtype=np.uint8)
+        self._img_buf = None  # reused frame buffer, sized on first draw
+        self._frame_src = None  # (env, vacuum) the frame was last built from
+        self._bg = None  # cached static background for blitting
+        self._last_draw = 0.0
+        self._last_state = None  # what the current frame shows, see update_display
+        self._min_dt = 1.0 / MAX_FPS
 
     # ----------  Interactive Sliders  ----------
     def add_epsilon_slider(self, initial_eps, vacuum):
@@ -45,6 +146,8 @@ class VisualizationManager:
         if self.fig is None:
             return None
 
+        import matplotlib.widgets as widgets
+
         # Position: [left, bottom, width, height]
         ax_eps = self.fig.add_axes([0.25, 0.06, 0.45, 0.03])
         slider = widgets.Slider(
@@ -52,9 +155,10 @@ class VisualizationManager:
         )
 
         def _upd(val):
-            vacuum.epsilon = round(val, 1)
+            vacuum.epsilon = val
 
         slider.on_changed(_upd)
+        self.fig.canvas.draw_idle()  # re-cache the background with the slider
         return slider
 
     def add_speed_slider(self):
@@ -62,6 +166,8 @@ class VisualizationManager:
         if self.fig is None:
             return None
 
+        import matplotlib.widgets as widgets
+
         # Position: [left, bottom, width, height]
         ax_speed = self.fig.add_axes([0.25, 0.02, 0.45, 0.03])
         # valinit=0.2 is the default delay (slower/watchable)
@@ -69,35 +175,82 @@ class VisualizationManager:
             ax_speed, "Delay (s)", 0.01, 1.0, valinit=0.2, valstep=0.01
         )
 
+        # Slow steps are already below the frame cap, so draw every one
+        def _upd(val):
+            self.set_max_fps(None if val >= 1.0 / MAX_FPS else MAX_FPS)
+
+        slider.on_changed(_upd)
+        _upd(slider.val)
+
         self.speed_slider = slider
+        self.fig.canvas.draw_idle()  # re-cache the background with the slider
         return slider
 
+    def set_max_fps(self, fps):
+        """Cap how often update_display redraws; None renders every update."""
+        self._min_dt = 1.0 / fps if fps else 0.0
+
     # ----------  Drawing Helpers  ----------
     def display_initial_state(self, env, vacuum):
-        # Close any existing figures to prevent stacking
-        plt.close("all")
-        self.fig, self.ax = plt.subplots(figsize=(10, 8))
+        if self.fig is None or not plt.fignum_exists(self.fig.number):
+            # Close any existing figures to prevent stacking
+            plt.close("all")
+            _use_gui_backend()
+            self.fig, self.ax = plt.subplots(figsize=(10, 8))
+
+            # Blitting: animated artists are left out of full redraws, and the
+            # rest of the figure is re-cached as background after each one
+            self.fig.canvas.mpl_connect("draw_event", self._on_draw)
+        else:
+            # Reuse the open window; drop the previous run's sliders/buttons
+            plt.figure(self.fig.number)
+            for extra in self.fig.axes:
+                if extra is not self.ax:
+                    extra.remove()
+            self.speed_slider = None
 
         # Adjust subplot to make room for sliders at bottom
-        plt.subplots_adjust(bottom=0.15)
+        self.fig.subplots_adjust(bottom=0.15)
 
         self._draw_grid(env, vacuum, "Initial State")
-        show_non_blocking()
 
-    def update_display(self, env, vacuum, step):
+        self._bg = None
+        self._last_state = None
+        # Synchronous draw so the blit background exists before the first step
+        self.fig.canvas.draw()
+        self.fig.canvas.flush_events()
+
+    def update_display(self, env, vacuum, step, force=False):
         if self.ax is None or not plt.fignum_exists(self.fig.number):
             return
 
+        # Nothing visible moved (e.g. idling on the charger): keep the frame.
+        # The step counter alone is not worth a redraw; forced updates catch up
+        state = (
+            vacuum.x,
+            vacuum.y,
+            vacuum.cleaned,
+            len(vacuum.visited),
+            vacuum.battery.current,
+            vacuum.epsilon,
+        )
+        if not force and state == self._last_state:
+            return
+
+        # Frame skipping: the simulation may step faster than we can render
+        now = time.monotonic()
+        if not force and now - self._last_draw < self._min_dt:
+            return
+        self._last_draw = now
+        self._last_state = state
+
         img = self._build_display_array(env, vacuum)
 
         # Optimize: Update data instead of redrawing everything
-        if len(self.ax.images) > 0:
-            self.ax.images[0].set_array(img)
-        else:
-            self.ax.imshow(img, cmap=self.cmap, vmin=0, vmax=5)
+        self._im.set_data(img)
 
         self.ax.set_title(
-            f"Step {step} – {vacuum.strategy.upper()}  ε={vacuum.epsilon}",
+            f"Step {step} – {vacuum.strategy.upper()}  ε={vacuum.epsilon:g}",
             fontsize=14,
             fontweight="bold",
         )
@@ -109,7 +262,7 @@ class VisualizationManager:
                 f"Cleaned: {vacuum.cleaned} | Visited: {len(vacuum.visited)}"
             )
 
-        show_non_blocking()
+        self._blit()
 
     def show_final_stats(self, vacuum):
         if self.ax is None or not plt.fignum_exists(self.fig.number):
@@ -122,7 +275,7 @@ class VisualizationManager:
             f"Efficiency: {summary['efficiency']:.3f}   Coverage: {summary['coverage_percentage']:.1f}%"
         )
 
-        self.ax.text(
+        overlay = self.ax.text(
             0.5,
             0.5,
             txt,
@@ -133,50 +286,104 @@ class VisualizationManager:
             fontsize=12,
             family="monospace",
         )
+        self._overlays.append(overlay)
+        self._mark_animated()
         show_non_blocking()
 
     # ----------  Comparison Charts  ----------
-    def create_comparison_charts(self, results):
-        fig, axs = plt.subplots(2, 2, figsize=(15, 10))
+    def create_comparison_charts(self, results, dpi=120, bbox_inches=None):
+        """
+        Show the comparison panels and save them as a PNG.
+
+        Args:
+            results (dict): Per-strategy lists of run metrics
+            dpi (int): Resolution of the saved file
+            bbox_inches: Passed to savefig; "tight" costs an extra draw pass
+        """
+        ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+        fname = f"strategy_comparison_{ts}.png"
+        save_kwargs = {"dpi": dpi, "bbox_inches": bbox_inches}
+
+        if _headless():
+            # Batch runs: nothing to show. The detached figure has its own Agg
+            # canvas, so pyplot and its backend are left alone
+            export = Figure(figsize=(15, 10))
+            FigureCanvasAgg(export)
+            self._plot_comparison(export, results)
+            export.savefig(fname, **save_kwargs)
+            print(f"Comparison chart saved: {fname}")
+            return
+
+        fig = plt.figure(figsize=(15, 10))
+        self._plot_comparison(fig, results)
+
+        # Render the file's pixels here through a temporary Agg canvas (as
+        # savefig itself does), so the panels are plotted only once
+        window_canvas = fig.canvas
+        agg = FigureCanvasAgg(fig)
+        try:
+            fig.savefig(io.BytesIO(), format="rgba", **save_kwargs)
+            pixels = np.asarray(agg.buffer_rgba()).copy()
+        finally:
+            fig.canvas = window_canvas
+
+        # PNG encoding is the other slow part: do it on a worker thread while
+        # the interactive window is up. Failures are handed back to this thread
+        errors = []
+
+        def _save():
+            try:
+                mimage.imsave(fname, pixels, format="png", dpi=dpi)
+            except Exception as exc:
+                errors.append(exc)
+            else:
+                print(f"Comparison chart saved: {fname}")
+
+        saver = threading.Thread(target=_save)
+        saver.start()
+
+        plt.show(block=True)
+        saver.join()
+        if errors:
+            raise errors[0]
+
+    def _plot_comparison(self, fig, results):
+        """Draw the 2x2 strategy comparison panels into fig."""
+        axs = fig.subplots(2, 2)
         fig.suptitle("Strategy Comparison", fontsize=16, fontweight="bold")
         strategies = list(results.keys())
         colours = ["red", "blue", "green"]
 
-        def get_metric(s, key):
-            return [r[key] for r in results[s]]
-
-        steps = [get_metric(s, "steps") for s in strategies]
-        bp1 = axs[0, 0].boxplot(steps, labels=strategies, patch_artist=True)
-        for patch, col in zip(bp1["boxes"], colours):
-            patch.set_facecolor(col)
-            patch.set_alpha(0.7)
-        axs[0, 0].set_title("Steps")
-        axs[0, 0].set_ylabel("count")
-
-        eff = [get_metric(s, "efficiency") for s in strategies]
-        bp2 = axs[0, 1].boxplot(eff, labels=strategies, patch_artist=True)
-        for patch, col in zip(bp2["boxes"], colours):
-            patch.set_facecolor(col)
-            patch.set_alpha(0.7)
-        axs[0, 1].set_title("Efficiency")
-        axs[0, 1].set_ylabel("dirt/step")
-
-        cov = [get_metric(s, "coverage") for s in strategies]
-        bp3 = axs[1, 0].boxplot(cov, labels=strategies, patch_artist=True)
-        for patch, col in zip(bp3["boxes"], colours):
-            patch.set_facecolor(col)
-            patch.set_alpha(0.7)
-        axs[1, 0].set_title("Coverage %")
-        axs[1, 0].set_ylabel("percent")
-
-        succ = []
-        for s in strategies:
-            total = len(results[s])
-            if total == 0:
-                succ.append(0)
-            else:
-                wins = sum(1 for r in results[s] if r["dirt_cleaned"] >= 1)
-                succ.append(wins / total)
+        # One pass per strategy pulls every plotted metric into arrays
+        def collect(s):
+            rs = results[s]
+            steps = np.empty(len(rs))
+            eff = np.empty(len(rs))
+            cov = np.empty(len(rs))
+            cleaned = np.empty(len(rs))
+            for i, r in enumerate(rs):
+                steps[i] = r["steps"]
+                eff[i] = r["efficiency"]
+                cov[i] = r["coverage"]
+                cleaned[i] = r["dirt_cleaned"]
+            return steps, eff, cov, cleaned
+
+        steps, eff, cov, cleaned = zip(*(collect(s) for s in strategies))
+        for ax, data, title, ylabel in (
+            (axs[0, 0], steps, "Steps", "count"),
+            (axs[0, 1], eff, "Efficiency", "dirt/step"),
+            (axs[1, 0], cov, "Coverage %", "percent"),
+        ):
+            stats = [_box_stats(d, s) for d, s in zip(data, strategies)]
+            bp = ax.bxp(stats, patch_artist=True)
+            for patch, col in zip(bp["boxes"], colours):
+                patch.set_facecolor(col)
+                patch.set_alpha(0.7)
+            ax.set_title(title)
+            ax.set_ylabel(ylabel)
+
+        # A run succeeds if it cleaned any dirt at all
+        succ = [(c >= 1).mean() if c.size else 0.0 for c in cleaned]
 
         bars = axs[1, 1].bar(strategies, succ, color=colours, alpha=0.7)
         axs[1, 1].set_title("Success Rate")
@@ -192,22 +399,32 @@ class VisualizationManager:
                 fontweight="bold",
             )
 
-        plt.tight_layout()
-        ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-        fname = f"strategy_comparison_{ts}.png"
-        plt.savefig(fname, dpi=300, bbox_inches="tight")
-        print(f"Comparison chart saved: {fname}")
-        plt.show(block=True)
+        fig.tight_layout()
 
     # ----------  Internal Helpers  ----------
     def _draw_grid(self, env, vacuum, title):
         self.ax.clear()
+        self._overlays = []
+        self.ax.set_aspect("equal")
+        self.ax.set_xlim(-0.5, env.size - 0.5)
+        self.ax.set_ylim(env.size - 0.5, -0.5)
+        self.ax.apply_aspect()  # frame scale is taken from the final axes box
         img = self._build_display_array(env, vacuum)
-        self.ax.imshow(img, cmap=self.cmap, vmin=0, vmax=5)
+        # Fixed norm: colour indices are always 0-6, never autoscale. The
+        # extent keeps data coordinates in cells whatever the frame scale
+        self._im = self.ax.imshow(
+            img,
+            cmap=self.cmap,
+            norm=Normalize(vmin=0, vmax=6, clip=True),
+            extent=(-0.5, env.size - 0.5, env.size - 0.5, -0.5),
+            interpolation="nearest",
+            interpolation_stage="rgba",
+            resample=False,
+        )
 
-        self.ax.set_xticks(np.arange(-0.5, env.size, 1), minor=True)
-        self.ax.set_yticks(np.arange(-0.5, env.size, 1), minor=True)
-        self.ax.grid(which="minor", color="gray", linewidth=1)
+        # Cell gridlines live in the frame itself so blitting the image
+        # cannot paint over them
+        self.ax.grid(False)
         self.ax.set_title(title, fontsize=14, fontweight="bold")
 
         legend_patches = [
@@ -218,9 +435,12 @@ class VisualizationManager:
             Rectangle((0, 0), 1, 1, facecolor="royalblue", label="Visited"),
             Rectangle((0, 0), 1, 1, facecolor="red", label="Vacuum"),
         ]
-        self.ax.legend(
-            handles=legend_patches, loc="upper right", bbox_to_anchor=(1.15, 1)
+        # Fully right of the grid, so it stays in the cached background and
+        # is only drawn (rasterized) on full redraws, never per step
+        legend = self.ax.legend(
+            handles=legend_patches, loc="upper left", bbox_to_anchor=(1.02, 1)
         )
+        legend.set_rasterized(True)
 
         bat = self.ax.text(
             0.02,
@@ -238,21 +458,71 @@ class VisualizationManager:
             bbox=dict(boxstyle="round", facecolor="lightgreen"),
         )
         self.texts = {"battery": bat, "stats": stats}
+        self._mark_animated()
+
+    def _animated_artists(self):
+        """
+        Artists blitted over the background each frame, in draw order: the
+        grid image, the texts that change, and anything drawn on top of them.
+        """
+        artists = [self._im, *self.texts.values(), *self._overlays, self.ax.title]
+        return sorted(artists, key=lambda a: a.get_zorder())
+
+    def _mark_animated(self):
+        """Keep the animated artists out of full redraws (and the background)."""
+        if self.fig.canvas.supports_blit:
+            for artist in self._animated_artists():
+                artist.set_animated(True)
+
+    def _on_draw(self, event):
+        """Re-cache the background after a full redraw (resize, sliders, ...)."""
+        canvas = self.fig.canvas
+        if not canvas.supports_blit:
+            return
+        # A resize changes how many pixels a cell gets
+        if self._frame_src is not None and self._frame_scale() != (
+            self._img_buf.shape[0] // self._frame_src[0].size
+        ):
+            self._im.set_data(self._build_display_array(*self._frame_src))
+        # The title sits outside the axes, so cache the whole figure
+        self._bg = canvas.copy_from_bbox(self.fig.bbox)
+        for artist in self._animated_artists():
+            self.fig.draw_artist(artist)
+
+    def _blit(self):
+        """Repaint only the animated artists on top of the cached background."""
+        if self._bg is None:
+            show_non_blocking()
+            return
+        canvas = self.fig.canvas
+        canvas.restore_region(self._bg)
+        for artist in self._animated_artists():
+            self.fig.draw_artist(artist)
+        canvas.blit(self.fig.bbox)
+        canvas.flush_events()
+
+    def _frame_scale(self):
+        """Frame pixels per cell: about one per screen pixel of the axes."""
+        box = self.ax.bbox
+        return max(1, int(min(box.width, box.height) // self._frame_src[0].size))
 
     def _build_display_array(self, env, vacuum):
-        arr = np.zeros((env.size, env.size), dtype=int)
-        for y in range(env.size):
-            for x in range(env.size):
-                val = env.grid[y][x]
-                if val == -1:
-                    arr[y, x] = 2  # obstacle
-                elif val == 1:
-                    arr[y, x] = 1  # dirt
-                elif val == 2:
-                    arr[y, x] = 3  # charger
-                elif val == 0:
-                    arr[y, x] = 0  # clean
-                if (x, y) in vacuum.visited and arr[y, x] == 0:
-                    arr[y, x] = 4  # visited
-        arr[vacuum.y, vacuum.x] = 5
+        self._frame_src = (env, vacuum)
+        scale = self._frame_scale()
+        shape = (env.size * scale, env.size * scale)
+        arr = self._img_buf
+        if arr is None or arr.shape != shape:
+            arr = self._img_buf = np.empty(shape, dtype=np.uint8)
+        # Same width as the linewidth=1 (point) gridlines this replaces
+        line = max(1, round(self.fig.dpi / 72))
+        _build_frame(
+            env.grid,
+            vacuum.visited_mask,
+            vacuum.y,
+            vacuum.x,
+            self._lut,
+            scale,
+            line,
+            arr,
+        )
         return arr